@@ -4,46 +4,57 @@
 from __future__ import annotations
 
 import math
+import os
 import sys
-from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable
 
 try:
-    from PIL import Image, ImageChops
+    import numpy as np
+except ModuleNotFoundError as exc:  # pragma: no cover - dependency missing
+    raise SystemExit("NumPy is required: pip install numpy") from exc
+
+try:
+    from lxml import etree
+except ModuleNotFoundError as exc:  # pragma: no cover - dependency missing
+    raise SystemExit("lxml is required: pip install lxml") from exc
+
+try:
+    from PIL import Image
 except ModuleNotFoundError as exc:  # pragma: no cover - dependency missing
     raise SystemExit("Pillow is required: pip install Pillow") from exc
 
+try:
+    from numba import njit
+except ModuleNotFoundError:  # pragma: no cover - optional accelerator
+    HAVE_NUMBA = False
+else:
+    HAVE_NUMBA = True
+
 
 ROOT = Path(__file__).resolve().parent.parent
 PORTFOLIO_HTML = ROOT / "portfolio.html"
 SUPPORTED_SUFFIXES = {".png", ".webp"}
 TARGET_ASPECT = 16 / 9
-
-
-class _ImageCollector(HTMLParser):
-    """Collect `src` attributes from `img` tags in an HTML document."""
-
-    def __init__(self) -> None:
-        super().__init__()
-        self.sources: List[str] = []
-
-    def handle_starttag(self, tag: str, attrs: List[tuple[str, str | None]]) -> None:
-        if tag.lower() != "img":
-            return
-        for name, value in attrs:
-            if name and name.lower() == "src" and value:
-                self.sources.append(value)
-
-    handle_startendtag = handle_starttag  # type: ignore[assignment]
+# Opaque pixels with any channel below this are content rather than border.
+WHITE_THRESHOLD = 155
 
 
 def _iter_local_image_paths(html_file: Path) -> Iterable[Path]:
-    parser = _ImageCollector()
-    parser.feed(html_file.read_text(encoding="utf-8"))
-
+    # Stream the document so paths are yielded while parsing. Each finished
+    # element is cleared and its processed siblings are dropped, so the tree
+    # only keeps the current path from the root instead of the whole page.
     seen: set[str] = set()
-    for raw_src in parser.sources:
+    for _, element in etree.iterparse(str(html_file), events=("end",), html=True):
+        raw_src = element.get("src") if element.tag == "img" else None
+        element.clear()
+        # The root has no parent, but comments or PIs before it are still
+        # reported as its previous siblings.
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
         if not raw_src or raw_src in seen:
             continue
         seen.add(raw_src)
@@ -59,45 +70,155 @@ def _iter_local_image_paths(html_file: Path) -> Iterable[Path]:
         yield path
 
 
-def _crop_whitespace(image: Image.Image) -> tuple[Image.Image, bool]:
-    """Remove surrounding transparent or near-white padding."""
+def _bbox(mask: np.ndarray) -> tuple[int, int, int, int] | None:
+    """Return the `(left, top, right, bottom)` box of the set pixels in `mask`."""
+
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(mask.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+if HAVE_NUMBA:
+
+    @njit(cache=True)
+    def _is_content(pixels, y, x, use_alpha):  # pragma: no cover - compiled
+        if use_alpha:
+            return pixels[y, x, 3] > 0
+        return (
+            pixels[y, x, 0] < WHITE_THRESHOLD
+            or pixels[y, x, 1] < WHITE_THRESHOLD
+            or pixels[y, x, 2] < WHITE_THRESHOLD
+        )
+
+    @njit(cache=True)
+    def _bbox_rgba(pixels, use_alpha):  # pragma: no cover - compiled
+        # Serial on purpose: main() already runs one worker process per core.
+        height, width = pixels.shape[0], pixels.shape[1]
+        left, top, right, bottom = width, -1, -1, -1
+        for y in range(height):
+            first = -1
+            for x in range(width):
+                if _is_content(pixels, y, x, use_alpha):
+                    first = x
+                    break
+            if first < 0:
+                continue
+            if top < 0:
+                top = y
+            bottom = y
+            left = min(left, first)
+            # Only columns beyond the current right edge can widen the box.
+            for x in range(width - 1, max(right, first), -1):
+                if _is_content(pixels, y, x, use_alpha):
+                    right = x
+                    break
+            right = max(right, first)
+        return left, top, right + 1, bottom + 1
+
+    def _content_bbox(pixels: np.ndarray, use_alpha: bool) -> tuple[int, int, int, int] | None:
+        left, top, right, bottom = _bbox_rgba(pixels, use_alpha)
+        if top < 0:
+            return None
+        return int(left), int(top), int(right), int(bottom)
+
+else:
+
+    def _content_bbox(pixels: np.ndarray, use_alpha: bool) -> tuple[int, int, int, int] | None:
+        if use_alpha:
+            return _bbox(pixels[..., 3] > 0)
+        # Per-channel compares avoid an H x W x 3 temporary and a strided reduction.
+        mask = (
+            (pixels[..., 0] < WHITE_THRESHOLD)
+            | (pixels[..., 1] < WHITE_THRESHOLD)
+            | (pixels[..., 2] < WHITE_THRESHOLD)
+        )
+        return _bbox(mask)
+
+
+def _crop_whitespace(image: Image.Image) -> tuple[np.ndarray, bool]:
+    """Remove surrounding transparent or near-white padding.
+
+    Returns the cropped pixels as an RGBA array view, so callers can pad or
+    save them without another intermediate image.
+    """
 
     # Ensure RGBA for consistent alpha handling.
-    rgba = image.convert("RGBA")
-    width, height = rgba.size
+    pixels = np.asarray(image.convert("RGBA"))
+    height, width = pixels.shape[:2]
 
     # First attempt: rely on alpha channel when present.
-    alpha = rgba.getchannel("A")
-    bbox = alpha.getbbox()
+    bbox = _content_bbox(pixels, use_alpha=True)
     if bbox and bbox != (0, 0, width, height):
-        return rgba.crop(bbox), True
-
-    # Fallback: detect light borders in opaque images by comparing against white.
-    rgb = rgba.convert("RGB")
-    background = Image.new("RGB", rgb.size, (255, 255, 255))
-    diff = ImageChops.difference(rgb, background)
-    # Amplify differences so subtle edges are detected.
-    diff = ImageChops.add(diff, diff, 2.0, -100)
-    bbox = diff.getbbox()
+        return _crop(pixels, bbox), True
+
+    # Fallback: detect light borders in opaque images. A pixel counts as
+    # content when any channel differs from white by more than 100.
+    bbox = _content_bbox(pixels, use_alpha=False)
     if bbox and bbox != (0, 0, width, height):
-        return rgba.crop(bbox), True
+        return _crop(pixels, bbox), True
+
+    return pixels, False
+
+
+def _crop(pixels: np.ndarray, bbox: tuple[int, int, int, int]) -> np.ndarray:
+    left, top, right, bottom = bbox
+    return pixels[top:bottom, left:right]
+
+
+def _matches_target_aspect(width: int, height: int) -> bool:
+    return math.isclose(width / height, TARGET_ASPECT, rel_tol=1e-2, abs_tol=1e-2)
 
-    return rgba, False
 
+def _edges_have_content(image: Image.Image) -> bool:
+    """Whether every border row and column of an opaque image has a non-white pixel.
 
-def _pad_to_ratio(image_path: Path) -> bool:
+    If so, the near-white crop in `_crop_whitespace` cannot trim anything.
+    """
+
+    width, height = image.size
+    edges = (
+        (0, 0, width, 1),
+        (0, height - 1, width, height),
+        (0, 0, 1, height),
+        (width - 1, 0, width, height),
+    )
+    for box in edges:
+        strip = np.asarray(image.crop(box).convert("RGB"))
+        if not (strip < WHITE_THRESHOLD).any():
+            return False
+    return True
+
+
+def _pad_to_ratio(image_path: Path) -> tuple[Path, bool]:
     with Image.open(image_path) as image:
+        width, height = image.size
+        if width == 0 or height == 0:
+            return image_path, False
+        # Opaque images already at the target ratio need no rewrite unless they
+        # have a light border; checking the four edges avoids the full RGBA
+        # conversion and bounding-box scan of `_crop_whitespace`.
+        if (
+            image.mode in ("RGB", "L")
+            # A tRNS colour key makes RGB/L pixels transparent on convert("RGBA").
+            and "transparency" not in image.info
+            and _matches_target_aspect(width, height)
+            and _edges_have_content(image)
+        ):
+            return image_path, False
+
         cropped, did_crop = _crop_whitespace(image)
-        width, height = cropped.size
+        height, width = cropped.shape[:2]
         if width == 0 or height == 0:
-            return False
+            return image_path, False
 
         current_ratio = width / height
-        if math.isclose(current_ratio, TARGET_ASPECT, rel_tol=1e-2, abs_tol=1e-2):
+        if _matches_target_aspect(width, height):
             if did_crop:
-                cropped.save(image_path)
-                return True
-            return False
+                Image.fromarray(cropped, "RGBA").save(image_path)
+                return image_path, True
+            return image_path, False
 
         if current_ratio > TARGET_ASPECT:
             # Image is wider than target ratio: extend height.
@@ -108,11 +229,16 @@ def _pad_to_ratio(image_path: Path) -> bool:
             new_width = int(round(height * TARGET_ASPECT))
             new_height = height
 
-        padded = Image.new("RGBA", (new_width, new_height), (0, 0, 0, 0))
-        offset = ((new_width - width) // 2, (new_height - height) // 2)
-        padded.paste(cropped, offset, cropped)
-        padded.save(image_path)
-    return True
+        # Fill a transparent buffer directly and copy the RGBA pixels as-is.
+        # Unlike the former masked `paste(cropped, offset, cropped)`, this does
+        # not multiply semi-transparent pixels by their own alpha a second time,
+        # so soft edges keep their original colour and opacity.
+        offset_x = (new_width - width) // 2
+        offset_y = (new_height - height) // 2
+        padded = np.zeros((new_height, new_width, 4), dtype=np.uint8)
+        padded[offset_y:offset_y + height, offset_x:offset_x + width] = cropped
+        Image.fromarray(padded, "RGBA").save(image_path)
+    return image_path, True
 
 
 def main() -> int:
@@ -121,11 +247,16 @@ def main() -> int:
         print(f"error: {html_file} not found", file=sys.stderr)
         return 1
 
+    # Each image is independent and the codec work happens inside Pillow's C
+    # code, so spread the files across all cores; `map` keeps output ordered
+    # and starts submitting work as soon as the parser yields the first path.
     processed = 0
-    for image_path in _iter_local_image_paths(html_file):
-        if _pad_to_ratio(image_path):
-            processed += 1
-            print(f"padded {image_path.relative_to(ROOT)}")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        image_paths = _iter_local_image_paths(html_file)
+        for image_path, changed in executor.map(_pad_to_ratio, image_paths, chunksize=4):
+            if changed:
+                processed += 1
+                print(f"padded {image_path.relative_to(ROOT)}")
 
     print(f"done. padded {processed} image(s).")
     return 0
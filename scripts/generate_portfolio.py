@@ -3,11 +3,22 @@
 
 from __future__ import annotations
 
+import functools
 import html
+import mmap
 import os
-import textwrap
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List
+
+try:
+    import yaml
+except ModuleNotFoundError as exc:  # pragma: no cover - dependency missing
+    raise SystemExit("PyYAML is required: pip install pyyaml") from exc
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader  # type: ignore[assignment]
 
 
 ROOT = Path(__file__).resolve().parent.parent
@@ -15,155 +26,72 @@ PORTFOLIO_DIR = ROOT / "portfolio"
 OUTPUT_FILE = ROOT / "portfolio.html"
 
 
-def read_portfolio_entries(portfolio_dir: Path) -> List[Dict[str, Any]]:
-    entries: List[Dict[str, Any]] = []
-    for entry_dir in sorted((p for p in portfolio_dir.iterdir() if p.is_dir()), reverse=True):
-        data_file = entry_dir / "content.yaml"
-        if not data_file.exists():
-            continue
-        raw = data_file.read_text(encoding="utf-8")
-        parsed = parse_simple_yaml(raw)
-        parsed["_path"] = entry_dir
-        entries.append(parsed)
-    return entries
+class _StringLoader(YamlLoader):
+    """Safe loader that resolves every plain scalar to a string.
 
+    Templates expect text, so `title: 2024` or an empty `video:` must not turn
+    into an int or None.
+    """
 
-def parse_simple_yaml(source: str) -> Dict[str, Any]:
-    """Parse a limited YAML subset suitable for the portfolio entries."""
 
-    lines = source.splitlines()
-    data: Dict[str, Any] = {}
-    idx = 0
+_StringLoader.yaml_implicit_resolvers = {}
 
-    while idx < len(lines):
-        line = lines[idx]
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            idx += 1
-            continue
-        if ":" not in line:
-            idx += 1
-            continue
 
-        key, value = line.split(":", 1)
-        key = key.strip()
-        value = value.lstrip()
+# Titles, URLs and captions repeat across cards and figures; memoize escaping.
+_escape = functools.lru_cache(maxsize=4096)(html.escape)
 
-        if value.startswith('"'):
-            text, idx = _parse_quoted_block(lines, idx, value)
-            data[key] = _normalize_multiline(text)
-            continue
 
-        if not value:
-            idx += 1
-            items, idx = _parse_list_block(lines, idx)
-            data[key] = items
+def read_portfolio_entries(portfolio_dir: Path) -> List[Dict[str, Any]]:
+    entries: List[Dict[str, Any]] = []
+    # `DirEntry.is_dir` uses the cached file type, avoiding a stat per entry.
+    with os.scandir(portfolio_dir) as it:
+        subdirs = sorted((e for e in it if e.is_dir()), key=lambda e: e.name, reverse=True)
+    for subdir in subdirs:
+        entry_dir = Path(subdir.path)
+        data_file = entry_dir / "content.yaml"
+        if not data_file.exists():
             continue
+        parsed = load_yaml(data_file)
+        parsed["_path"] = entry_dir
+        entries.append(parsed)
+    return entries
 
-        data[key] = _clean_scalar(value)
-        idx += 1
 
+def load_yaml(data_file: Path) -> Dict[str, Any]:
+    """Parse a YAML file straight from a memory map, without decoding it into a str."""
+
+    with data_file.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            # mmap cannot map empty files.
+            return {}
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            try:
+                data = yaml.load(mapped, Loader=_StringLoader)
+            except yaml.YAMLError as exc:
+                # The mapped stream is reported as "<file>", so name it here.
+                raise ValueError(f"{data_file}: invalid YAML: {exc}") from exc
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{data_file}: expected a mapping at the top level, got {type(data).__name__}")
     return data
 
 
-def _clean_scalar(value: str) -> str:
-    value = value.strip()
-    if value.startswith('"') and value.endswith('"') and len(value) >= 2:
-        value = value[1:-1]
-    return value.strip()
-
-
-def _parse_quoted_block(lines: List[str], idx: int, current: str) -> Tuple[str, int]:
-    text = current[1:]
-    if text.endswith('"') and not text.endswith('\\"'):
-        return text[:-1], idx + 1
-
-    pieces: List[str] = []
-    if text:
-        pieces.append(text)
-    idx += 1
-
-    while idx < len(lines):
-        segment = lines[idx]
-        stripped = segment.strip()
-        if not stripped:
-            pieces.append("")
-            idx += 1
-            continue
-        if stripped.startswith("#"):
-            idx += 1
-            continue
-        if stripped.endswith('"') and not stripped.endswith('\\"'):
-            pieces.append(segment.rstrip()[:-1])
-            idx += 1
-            break
-        pieces.append(segment.rstrip())
-        idx += 1
-
-    return "\n".join(pieces), idx
-
-
-def _parse_list_block(lines: List[str], idx: int) -> Tuple[List[Dict[str, Any]], int]:
-    items: List[Dict[str, Any]] = []
-    while idx < len(lines):
-        line = lines[idx]
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#"):
-            idx += 1
-            continue
-        if not line.startswith("  "):
-            break
-        if stripped.startswith("-"):
-            entry: Dict[str, Any] = {}
-            inline = stripped[1:].strip()
-            if inline and ":" in inline:
-                sub_key, sub_value = inline.split(":", 1)
-                entry[sub_key.strip()] = _clean_scalar(sub_value)
-            idx += 1
-            while idx < len(lines):
-                detail = lines[idx]
-                stripped_detail = detail.strip()
-                if not stripped_detail or stripped_detail.startswith("#"):
-                    idx += 1
-                    continue
-                if not detail.startswith("    "):
-                    break
-                if ":" in stripped_detail:
-                    sub_key, sub_value = stripped_detail.split(":", 1)
-                    entry[sub_key.strip()] = _clean_scalar(sub_value)
-                idx += 1
-            items.append(entry)
-        else:
-            idx += 1
-    return items, idx
-
-
-def _normalize_multiline(text: str) -> str:
-    lines = text.splitlines()
-    # Trim leading/trailing blank lines
-    while lines and not lines[0].strip():
-        lines.pop(0)
-    while lines and not lines[-1].strip():
-        lines.pop()
-    if not lines:
-        return ""
-    dedented = textwrap.dedent("\n".join(lines))
-    return dedented.strip()
-
-
 def render_page(entries: Iterable[Dict[str, Any]]) -> str:
-    cards_html = "\n".join(render_card(data) for data in entries)
-    return PAGE_TEMPLATE.replace("{{CARDS}}", cards_html)
-
-
-def render_card(data: Dict[str, Any]) -> str:
+    # Every card appends its template slices to one flat list, which is
+    # joined exactly once instead of building nested intermediate strings.
+    parts: List[str] = [PAGE_PARTS[0]]
+    for index, data in enumerate(entries):
+        if index:
+            parts.append("\n")
+        append_card(parts, data)
+    parts.append(PAGE_PARTS[1])
+    return "".join(parts)
+
+
+def append_card(parts: List[str], data: Dict[str, Any]) -> None:
     entry_dir: Path = data.get("_path", PORTFOLIO_DIR)
-    title = html.escape(data.get("title", "Untitled"))
-    description_html = format_description(data.get("description", ""))
-    description_block = DESCRIPTION_TEMPLATE.replace("{{CONTENT}}", description_html) if description_html else ""
-
-    images = data.get("images") or []
-    gallery_html = render_gallery(images, entry_dir, title)
+    title = _escape(data.get("title", "Untitled"))
 
     paper_components = render_paper_components(data.get("paper") or [])
 
@@ -175,14 +103,14 @@ def render_card(data: Dict[str, Any]) -> str:
         video_url = video_info
 
     video_button = render_video_button(video_url)
-    links_html = render_links([*paper_components, video_button])
 
-    card = CARD_TEMPLATE
-    card = card.replace("{{TITLE}}", title)
-    card = card.replace("{{GALLERY}}", gallery_html)
-    card = card.replace("{{DESCRIPTION}}", description_block)
-    card = card.replace("{{LINKS}}", links_html)
-    return card
+    parts.extend((CARD_PARTS[0], title, CARD_PARTS[1]))
+    append_gallery(parts, data.get("images") or [], entry_dir, title)
+    parts.append(CARD_PARTS[2])
+    append_description(parts, data.get("description", ""))
+    parts.append(CARD_PARTS[3])
+    append_links(parts, [*paper_components, video_button])
+    parts.append(CARD_PARTS[4])
 
 
 def first_dict_with_key(items: Iterable[Dict[str, Any]], key: str) -> Dict[str, Any]:
@@ -214,80 +142,91 @@ def render_paper_components(paper_items: Iterable[Dict[str, Any]]) -> List[str]:
     return components
 
 
-def format_description(text: str) -> str:
+def append_description(parts: List[str], text: str) -> None:
     text = text.strip()
     if not text:
-        return ""
-    paragraphs = [
-        f"<p>{html.escape(part.strip())}</p>"
-        for part in split_paragraphs(text)
-        if part.strip()
-    ]
-    return "\n".join(paragraphs)
+        return
+    parts.append(DESCRIPTION_PARTS[0])
+    for index, paragraph in enumerate(split_paragraphs(text)):
+        if index:
+            parts.append("\n")
+        parts.extend(("<p>", _escape(paragraph), "</p>"))
+    parts.append(DESCRIPTION_PARTS[1])
 
 
 def split_paragraphs(text: str) -> Iterable[str]:
-    buffer: List[str] = []
+    # YAML folds single line breaks in quoted scalars into spaces and keeps
+    # blank lines as newlines, so every remaining line is its own paragraph.
+    # Paragraphs are yielded already stripped and non-empty.
     for line in text.splitlines():
-        if not line.strip():
-            if buffer:
-                yield " ".join(buffer)
-                buffer = []
-            continue
-        buffer.append(line.strip())
-    if buffer:
-        yield " ".join(buffer)
+        stripped = line.strip()
+        if stripped:
+            yield stripped
 
 
 def render_paper_button(url: str, label: str = "") -> str:
     if not url:
         return ""
-    escaped = html.escape(url)
-    button = PAPER_BUTTON_TEMPLATE.replace("{{URL}}", escaped)
     button_label = label.strip() or "Read Paper"
-    return button.replace("{{LABEL}}", html.escape(button_label))
+    return PAPER_BUTTON_TEMPLATE.format_map({"url": _escape(url), "label": _escape(button_label)})
 
 
 def render_video_button(url: str) -> str:
     if not url:
         return ""
-    escaped = html.escape(url)
-    return VIDEO_BUTTON_TEMPLATE.replace("{{URL}}", escaped)
+    return VIDEO_BUTTON_TEMPLATE.format_map({"url": _escape(url)})
 
 
 def render_status_badge(status: str) -> str:
-    clean = html.escape(status.strip())
-    return STATUS_BADGE_TEMPLATE.replace("{{STATUS}}", clean)
+    clean = _escape(status.strip())
+    return STATUS_BADGE_TEMPLATE.format_map({"status": clean})
 
 
-def render_links(components: Iterable[str]) -> str:
+def append_links(parts: List[str], components: Iterable[str]) -> None:
     items = [item for item in components if item]
     if not items:
-        return ""
-    joined = "\n".join(items)
-    return LINKS_TEMPLATE.replace("{{ITEMS}}", joined)
+        return
+    parts.append(LINKS_PARTS[0])
+    for index, item in enumerate(items):
+        if index:
+            parts.append("\n")
+        parts.append(item)
+    parts.append(LINKS_PARTS[1])
 
 
-def render_gallery(images: List[Dict[str, Any]], entry_dir: Path, fallback_title: str) -> str:
-    figures = []
-    for image in images:
-        src_value = image.get("src")
-        if not src_value:
-            continue
-        relative = os.path.relpath(entry_dir / src_value, ROOT)
-        img_src = html.escape(Path(relative).as_posix())
+def append_gallery(parts: List[str], images: List[Dict[str, Any]], entry_dir: Path, fallback_title: str) -> None:
+    figures = [image for image in images if isinstance(image, dict) and image.get("src")]
+    if not figures:
+        return
+    fallback_alt = _escape(fallback_title)
+    base = entry_dir.relative_to(ROOT).as_posix()
+    parts.append(GALLERY_PARTS[0])
+    for index, image in enumerate(figures):
+        if index:
+            parts.append("\n")
+        img_src = _escape(f"{base}/{image['src']}")
         caption_raw = image.get("caption", "")
-        caption_html = html.escape(caption_raw) if caption_raw else ""
-        alt_text = caption_html or html.escape(fallback_title)
-        figure = FIGURE_TEMPLATE.replace("{{SRC}}", img_src).replace("{{ALT}}", alt_text)
+        caption_html = _escape(caption_raw) if caption_raw else ""
+        alt_text = caption_html or fallback_alt
+        parts.extend((FIGURE_PARTS[0], img_src, FIGURE_PARTS[1], alt_text, FIGURE_PARTS[2]))
         if caption_html:
-            figure = figure.replace("{{CAPTION}}", FIGURE_CAPTION_TEMPLATE.replace("{{TEXT}}", caption_html))
-        else:
-            figure = figure.replace("{{CAPTION}}", "")
-        figures.append(figure)
-    if not figures:
-        return ""
-    return GALLERY_TEMPLATE.replace("{{FIGURES}}", "\n".join(figures))
+            parts.extend((FIGURE_CAPTION_PARTS[0], caption_html, FIGURE_CAPTION_PARTS[1]))
+        parts.append(FIGURE_PARTS[3])
+    parts.append(GALLERY_PARTS[1])
+
+
+def split_template(template: str, *fields: str) -> List[str]:
+    """Split `template` around its `{field}` placeholders, in the given order."""
+
+    pieces: List[str] = []
+    rest = template
+    for field in fields:
+        head, sep, rest = rest.partition("{" + field + "}")
+        if not sep:
+            raise ValueError(f"placeholder {{{field}}} not found in template")
+        pieces.append(head)
+    pieces.append(rest)
+    return pieces
 
 
 PAGE_TEMPLATE = """<!DOCTYPE html>
@@ -328,7 +267,7 @@ PAGE_TEMPLATE = """<!DOCTYPE html>
       <div class=\"section__inner\">
        <!--<h2>Featured Work</h2>-->
         <div class=\"portfolio-grid\">
-{{CARDS}}
+{cards}
         </div>
       </div>
     </section>
@@ -349,41 +288,41 @@ PAGE_TEMPLATE = """<!DOCTYPE html>
 
 
 CARD_TEMPLATE = """          <article class=\"portfolio-card\">
-            <h3>{{TITLE}}</h3>
-{{GALLERY}}
-{{DESCRIPTION}}
-{{LINKS}}
+            <h3>{title}</h3>
+{gallery}
+{description}
+{links}
           </article>"""
 
 
 GALLERY_TEMPLATE = """            <div class=\"portfolio-card__gallery\">
-{{FIGURES}}
+{figures}
             </div>"""
 
 
 FIGURE_TEMPLATE = """              <figure class=\"portfolio-card__figure\">
-                <img src=\"{{SRC}}\" alt=\"{{ALT}}\">
-{{CAPTION}}
+                <img src=\"{src}\" alt=\"{alt}\">
+{caption}
               </figure>"""
 
 
-FIGURE_CAPTION_TEMPLATE = """                <figcaption>{{TEXT}}</figcaption>"""
+FIGURE_CAPTION_TEMPLATE = """                <figcaption>{text}</figcaption>"""
 
 
 DESCRIPTION_TEMPLATE = """            <details class=\"portfolio-card__details\">
               <summary class=\"portfolio-card__summary\">Description</summary>
               <div class=\"portfolio-card__description\">
-{{CONTENT}}
+{content}
               </div>
             </details>"""
 
 
 LINKS_TEMPLATE = """            <div class=\"portfolio-card__links\">
-{{ITEMS}}
+{items}
             </div>"""
 
 
-PAPER_BUTTON_TEMPLATE = """<a class=\"button button--doc\" href=\"{{URL}}\" target=\"_blank\" rel=\"noopener\">
+PAPER_BUTTON_TEMPLATE = """<a class=\"button button--doc\" href=\"{url}\" target=\"_blank\" rel=\"noopener\">
                   <span class=\"button__icon\" aria-hidden=\"true\">
                     <svg viewBox=\"0 0 32 32\" role=\"img\" focusable=\"false\">
                       <path d=\"M9 3h11l7 7v15a4 4 0 0 1-4 4H9a4 4 0 0 1-4-4V7a4 4 0 0 1 4-4z\" fill=\"none\" stroke=\"currentColor\" stroke-width=\"2\" stroke-linejoin=\"round\"/>
@@ -392,16 +331,25 @@ PAPER_BUTTON_TEMPLATE = """<a class=\"button button--doc\" href=\"{{URL}}\" targ
                       <text x=\"16\" y=\"25\" text-anchor=\"middle\" font-family=\"Inter, 'Segoe UI', sans-serif\" font-size=\"7\" font-weight=\"700\" fill=\"#ffffff\">PDF</text>
                     </svg>
                   </span>
-                  <span class=\"button__label\">{{LABEL}}</span>
+                  <span class=\"button__label\">{label}</span>
                 </a>"""
 
 
-VIDEO_BUTTON_TEMPLATE = """<a class=\"button button--video\" href=\"{{URL}}\" target=\"_blank\" rel=\"noopener\">
+VIDEO_BUTTON_TEMPLATE = """<a class=\"button button--video\" href=\"{url}\" target=\"_blank\" rel=\"noopener\">
                   <span class=\"button__label\">Watch Video</span>
                 </a>"""
 
 
-STATUS_BADGE_TEMPLATE = """<span class=\"badge badge--status\">{{STATUS}}</span>"""
+STATUS_BADGE_TEMPLATE = """<span class=\"badge badge--status\">{status}</span>"""
+
+
+PAGE_PARTS = split_template(PAGE_TEMPLATE, "cards")
+CARD_PARTS = split_template(CARD_TEMPLATE, "title", "gallery", "description", "links")
+GALLERY_PARTS = split_template(GALLERY_TEMPLATE, "figures")
+FIGURE_PARTS = split_template(FIGURE_TEMPLATE, "src", "alt", "caption")
+FIGURE_CAPTION_PARTS = split_template(FIGURE_CAPTION_TEMPLATE, "text")
+DESCRIPTION_PARTS = split_template(DESCRIPTION_TEMPLATE, "content")
+LINKS_PARTS = split_template(LINKS_TEMPLATE, "items")
 
 
 def main() -> None: